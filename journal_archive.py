@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+High Performance Takeoff Tracker - Journal Archive
+Packs many daily journal exports into one compact archive and restores them
+
+Every entry repeats the same morning prompt text and most of the same
+schedule grid. The archive interns those strings into a shared table,
+stores each distinct prompt list and schedule once, and records every
+entry as a reference plus the time slots that differ. Unpacking rebuilds the
+exact JSON written by "Download JSON" in daily_journal.html.
+"""
+
+import argparse
+import glob
+import gzip
+import json
+import os
+import sys
+
+ARCHIVE_FORMAT = 'takeoff-archive'
+ARCHIVE_VERSION = 1
+
+PROMPT_KEYS = ['prompt', 'response']
+SCHEDULE_KEYS = ['time', 'activity', 'domain']
+
+# How many recently used schedule templates are tried as a delta base
+RECENT_TEMPLATES = 8
+
+
+class ArchiveWriter:
+    """Builds the shared dictionaries while entries are added in order."""
+
+    def __init__(self):
+        self.strings = []
+        self.string_ids = {}
+        self.prompt_sets = []
+        self.prompt_set_ids = {}
+        self.templates = []
+        self.template_ids = {}
+        self.recent_templates = []
+        self.entries = []
+        self.verbatim = {'prompts': [], 'schedule': []}
+
+    def intern(self, text):
+        if text not in self.string_ids:
+            self.string_ids[text] = len(self.strings)
+            self.strings.append(text)
+        return self.string_ids[text]
+
+    def add(self, entry):
+        index = len(self.entries)
+        packed = dict(entry)
+        if 'prompts' in entry:
+            if is_packable_prompts(entry['prompts']):
+                packed['prompts'] = self.pack_prompts(entry['prompts'])
+            else:
+                self.verbatim['prompts'].append(index)
+        if 'schedule' in entry:
+            if is_packable_schedule(entry['schedule']):
+                packed['schedule'] = self.pack_schedule(entry['schedule'])
+            else:
+                self.verbatim['schedule'].append(index)
+        self.entries.append(packed)
+
+    def pack_prompts(self, prompts):
+        key = tuple(self.intern(item['prompt']) for item in prompts)
+        if key not in self.prompt_set_ids:
+            self.prompt_set_ids[key] = len(self.prompt_sets)
+            self.prompt_sets.append(list(key))
+        return {
+            'set': self.prompt_set_ids[key],
+            'responses': [item['response'] for item in prompts],
+        }
+
+    def pack_schedule(self, schedule):
+        rows = [[self.intern(item[k]) for k in SCHEDULE_KEYS] for item in schedule]
+        key = tuple(map(tuple, rows))
+        if key in self.template_ids:
+            return self.use_template(self.template_ids[key], {})
+
+        # The UI only exports filled slots, so adding one shifts every later
+        # row; deltas are keyed by time against the closest recent template
+        best = None
+        for ref in self.recent_templates:
+            delta = schedule_delta(self.templates[ref], rows, self.strings)
+            if delta is None:
+                continue
+            cost = len(delta.get('set', {})) + len(delta.get('drop', []))
+            if best is None or cost < best[0]:
+                best = (cost, ref, delta)
+        if best is not None and best[0] <= len(rows) // 2:
+            return self.use_template(best[1], best[2])
+
+        ref = len(self.templates)
+        self.template_ids[key] = ref
+        self.templates.append(rows)
+        return self.use_template(ref, {})
+
+    def use_template(self, ref, delta):
+        if ref in self.recent_templates:
+            self.recent_templates.remove(ref)
+        self.recent_templates.insert(0, ref)
+        del self.recent_templates[RECENT_TEMPLATES:]
+        return {'ref': ref, **delta}
+
+    def to_dict(self):
+        return {
+            'format': ARCHIVE_FORMAT,
+            'version': ARCHIVE_VERSION,
+            'strings': self.strings,
+            'promptSets': self.prompt_sets,
+            'scheduleTemplates': self.templates,
+            'verbatimFields': self.verbatim,
+            'entries': self.entries,
+        }
+
+
+def is_packable_prompts(prompts):
+    # Anything that does not look exactly like the UI's output is kept verbatim
+    return isinstance(prompts, list) and all(
+        isinstance(item, dict) and list(item) == PROMPT_KEYS
+        and isinstance(item['prompt'], str)
+        for item in prompts
+    )
+
+
+def is_packable_schedule(schedule):
+    return isinstance(schedule, list) and all(
+        isinstance(item, dict) and list(item) == SCHEDULE_KEYS
+        and all(isinstance(item[k], str) for k in SCHEDULE_KEYS)
+        for item in schedule
+    )
+
+
+def schedule_delta(base, rows, strings):
+    """
+    Describe rows as changes to base, keyed by time string id.
+    Returns None when the delta would not rebuild rows exactly, e.g. for
+    repeated or out-of-order times.
+    """
+    base_slots = {row[0]: row[1:] for row in base}
+    slots = {row[0]: row[1:] for row in rows}
+    if len(base_slots) != len(base) or len(slots) != len(rows):
+        return None
+
+    delta = {}
+    changes = {str(t): slot for t, slot in slots.items() if base_slots.get(t) != slot}
+    drops = [t for t in base_slots if t not in slots]
+    if changes:
+        delta['set'] = changes
+    if drops:
+        delta['drop'] = drops
+    if apply_schedule_delta(base, delta, strings) != rows:
+        return None
+    return delta
+
+
+def apply_schedule_delta(base, delta, strings):
+    drops = set(delta.get('drop', []))
+    rows = [row for row in base if row[0] not in drops]
+    changes = delta.get('set')
+    if not changes:
+        return rows
+
+    positions = {row[0]: i for i, row in enumerate(rows)}
+    inserts = []
+    for time_id, slot in changes.items():
+        time_id = int(time_id)
+        if time_id in positions:
+            rows[positions[time_id]] = [time_id] + slot
+        else:
+            inserts.append([time_id] + slot)
+    # New slots go in time order, as the UI lists them
+    for row in inserts:
+        time = strings[row[0]]
+        position = next((i for i, r in enumerate(rows) if strings[r[0]] > time), len(rows))
+        rows.insert(position, row)
+    return rows
+
+
+def pack_entries(entries):
+    writer = ArchiveWriter()
+    for entry in entries:
+        writer.add(entry)
+    return writer.to_dict()
+
+
+def unpack_archive(archive):
+    if archive.get('format') != ARCHIVE_FORMAT:
+        raise ValueError('Not a TAKEOFF archive')
+    if archive.get('version') != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version: {archive.get('version')}")
+
+    strings = archive['strings']
+    prompt_sets = [[strings[text] for text in texts] for texts in archive['promptSets']]
+    templates = archive['scheduleTemplates']
+    verbatim = {field: set(indexes) for field, indexes in archive['verbatimFields'].items()}
+
+    entries = []
+    for index, packed in enumerate(archive['entries']):
+        entry = dict(packed)
+        if 'prompts' in packed and index not in verbatim['prompts']:
+            prompts = packed['prompts']
+            entry['prompts'] = [
+                {'prompt': text, 'response': response}
+                for text, response in zip(prompt_sets[prompts['set']], prompts['responses'])
+            ]
+        if 'schedule' in packed and index not in verbatim['schedule']:
+            schedule = packed['schedule']
+            rows = apply_schedule_delta(templates[schedule['ref']], schedule, strings)
+            entry['schedule'] = [
+                {'time': strings[t], 'activity': strings[a], 'domain': strings[d]}
+                for t, a, d in rows
+            ]
+        entries.append(entry)
+    return entries
+
+
+def check_dates(entries, sources):
+    """Each entry restores to journal_<date>.json, so dates must be present and unique."""
+    seen = {}
+    for entry, source in zip(entries, sources):
+        date = entry.get('date')
+        if not isinstance(date, str) or not date:
+            raise ValueError(f"{source}: entry has no date")
+        if date in seen:
+            raise ValueError(f"{source}: duplicate entry for {date} (also in {seen[date]})")
+        seen[date] = source
+
+
+def open_text(path, mode):
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def load_entries(paths):
+    """Read journal_*.json exports; a file may hold one entry or a list."""
+    entries = []
+    sources = []
+    for path in paths:
+        with open_text(path, 'r') as f:
+            data = json.load(f)
+        for entry in data if isinstance(data, list) else [data]:
+            entries.append(entry)
+            sources.append(path)
+    check_dates(entries, sources)
+    entries.sort(key=lambda entry: entry['date'])
+    return entries
+
+
+def pack(args):
+    paths = [p for pattern in args.inputs for p in sorted(glob.glob(pattern))]
+    if not paths:
+        sys.exit('No journal files matched')
+    try:
+        entries = load_entries(paths)
+    except ValueError as e:
+        sys.exit(f"Cannot pack: {e}")
+    archive = pack_entries(entries)
+    with open_text(args.output, 'w') as f:
+        json.dump(archive, f, ensure_ascii=False, separators=(',', ':'))
+    print(f"Packed {len(entries)} entries into: {args.output}")
+
+
+def unpack(args):
+    with open_text(args.archive, 'r') as f:
+        entries = unpack_archive(json.load(f))
+    try:
+        check_dates(entries, [f"entry {i}" for i in range(len(entries))])
+    except ValueError as e:
+        sys.exit(f"Cannot unpack: {e}")
+    os.makedirs(args.output_dir, exist_ok=True)
+    for entry in entries:
+        path = os.path.join(args.output_dir, f"journal_{entry['date']}.json")
+        # Same layout as JSON.stringify(data, null, 2) in the journal UI
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, indent=2)
+    print(f"Restored {len(entries)} entries to: {args.output_dir}")
+
+
+# Main execution
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack or restore TAKEOFF journal exports")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    pack_parser = commands.add_parser('pack', help="Combine journal_*.json files into an archive")
+    pack_parser.add_argument('inputs', nargs='+', help="Journal files or glob patterns")
+    pack_parser.add_argument('-o', '--output', default='takeoff_archive.json.gz',
+                             help="Archive path (gzip-compressed when it ends in .gz)")
+    pack_parser.set_defaults(func=pack)
+
+    unpack_parser = commands.add_parser('unpack', help="Restore journal_*.json files from an archive")
+    unpack_parser.add_argument('archive', help="Archive written by pack")
+    unpack_parser.add_argument('-o', '--output-dir', default='.',
+                               help="Directory for the restored journal files")
+    unpack_parser.set_defaults(func=unpack)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,134 @@
+"""Round-trip tests for journal_archive.py"""
+
+import copy
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from journal_archive import pack_entries, unpack_archive
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SAMPLE = os.path.join(HERE, 'journal_2026-01-05.json')
+SCRIPT = os.path.join(HERE, 'journal_archive.py')
+
+
+def load_sample():
+    with open(SAMPLE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def run(*args):
+    return subprocess.run([sys.executable, SCRIPT, *args], capture_output=True, text=True)
+
+
+def roundtrip(entries):
+    # Go through JSON text so string-keyed deltas are exercised as on disk
+    archive = json.loads(json.dumps(pack_entries(entries)))
+    return archive, unpack_archive(archive)
+
+
+def dated_copies(count):
+    entries = []
+    for day in range(count):
+        entry = copy.deepcopy(load_sample())
+        entry['date'] = f"2026-02-{day + 1:02d}"
+        entries.append(entry)
+    return entries
+
+
+def test_sample_file_restores_byte_for_byte(tmp_path):
+    archive = tmp_path / 'archive.json.gz'
+    assert run('pack', SAMPLE, '-o', str(archive)).returncode == 0
+    assert run('unpack', str(archive), '-o', str(tmp_path / 'out')).returncode == 0
+
+    with open(SAMPLE, 'rb') as f:
+        original = f.read()
+    with open(tmp_path / 'out' / 'journal_2026-01-05.json', 'rb') as f:
+        assert f.read() == original
+
+
+def test_inserted_and_removed_slots_reuse_templates():
+    entries = dated_copies(20)
+    for i, entry in enumerate(entries):
+        if i % 2:
+            entry['schedule'].insert(1, {'time': '06:30', 'activity': 'Stretch ', 'domain': 'health'})
+        if i % 3 == 0:
+            del entry['schedule'][5]
+        if i % 5 == 0:
+            entry['schedule'][-1]['activity'] = 'Read '
+
+    archive, restored = roundtrip(entries)
+    assert restored == entries
+    assert len(archive['scheduleTemplates']) == 1
+    assert all(json.dumps(a) == json.dumps(b) for a, b in zip(restored, entries))
+
+
+def test_identical_schedules_share_one_template():
+    entries = dated_copies(10)
+    for entry in entries[::2]:
+        entry['schedule'] = entry['schedule'][:3]
+
+    archive, restored = roundtrip(entries)
+    assert restored == entries
+    assert len(archive['scheduleTemplates']) <= 2
+
+
+def test_non_ui_shapes_are_kept_verbatim():
+    entries = dated_copies(4)
+    entries[0]['prompts'] = {'a': 1}
+    entries[1]['prompts'] = {'set': 0, 'responses': []}
+    entries[2]['schedule'] = [{'time': '06:00', 'activity': 'Run', 'domain': 'health', 'extra': 1}]
+    entries[3]['schedule'] = {'ref': 0}
+    del entries[3]['prompts']
+
+    archive, restored = roundtrip(entries)
+    assert restored == entries
+    assert archive['verbatimFields'] == {'prompts': [0, 1], 'schedule': [2, 3]}
+
+
+def test_out_of_order_schedule_round_trips():
+    entries = dated_copies(2)
+    entries[1]['schedule'] = entries[1]['schedule'][::-1]
+    entries[1]['schedule'].append(dict(entries[1]['schedule'][0]))
+
+    _, restored = roundtrip(entries)
+    assert restored == entries
+
+
+def test_pack_rejects_duplicate_dates(tmp_path):
+    listed = tmp_path / 'resaved.json'
+    listed.write_text(json.dumps([load_sample()]), encoding='utf-8')
+
+    result = run('pack', SAMPLE, str(listed), '-o', str(tmp_path / 'archive.json'))
+    assert result.returncode != 0
+    assert 'duplicate entry for 2026-01-05' in result.stderr
+    assert not (tmp_path / 'archive.json').exists()
+
+
+def test_pack_rejects_missing_date(tmp_path):
+    entry = load_sample()
+    del entry['date']
+    undated = tmp_path / 'undated.json'
+    undated.write_text(json.dumps(entry), encoding='utf-8')
+
+    result = run('pack', str(undated), '-o', str(tmp_path / 'archive.json'))
+    assert result.returncode != 0
+    assert 'has no date' in result.stderr
+
+
+def test_unpack_rejects_duplicate_dates(tmp_path):
+    archive = tmp_path / 'archive.json'
+    archive.write_text(json.dumps(pack_entries([load_sample(), load_sample()])), encoding='utf-8')
+
+    result = run('unpack', str(archive), '-o', str(tmp_path / 'out'))
+    assert result.returncode != 0
+    assert 'duplicate entry for 2026-01-05' in result.stderr
+    assert not (tmp_path / 'out').exists()
+
+
+def test_unpack_rejects_other_files():
+    with pytest.raises(ValueError):
+        unpack_archive({'format': 'something-else'})